@@ -49,7 +49,9 @@ import asyncio
 import base64
 import io
 import os
+import socket
 import sys
+import time
 import traceback
 import json
 
@@ -79,6 +81,12 @@ MODEL = "models/gemini-2.0-flash-exp"
 
 DEFAULT_MODE = "screen"
 
+# Audio activity datagrams understood by tray_app.py
+AUDIO_ACTIVE_MSG = b"1"
+AUDIO_INACTIVE_MSG = b"0"
+# Seconds without playback before audio is reported as stopped
+AUDIO_IDLE_DELAY = 0.2
+
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -135,9 +143,18 @@ async def handle_tool_call(session, tool_call):
     await session.send(input=tool_response)
     
 class AudioLoop:
-    def __init__(self, video_mode=DEFAULT_MODE):
+    def __init__(self, video_mode=DEFAULT_MODE, status_port=None):
         self.video_mode = video_mode
 
+        # Optional localhost port to report playback activity to
+        self.status_port = status_port
+        self.status_socket = None
+        if status_port is not None:
+            self.status_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.audio_active = False
+        self.last_write_ts = 0.0
+        self.idle_timer = None
+
         self.audio_in_queue = None
         self.out_queue = None
 
@@ -338,6 +355,41 @@ class AudioLoop:
             while not self.audio_in_queue.empty():
                 self.audio_in_queue.get_nowait()
 
+    def _report_audio_active(self, active):
+        "Send a datagram to the status port when playback starts or stops"
+        if active == self.audio_active:
+            return
+        self.audio_active = active
+        if self.status_socket is None:
+            return
+        try:
+            self.status_socket.sendto(
+                AUDIO_ACTIVE_MSG if active else AUDIO_INACTIVE_MSG,
+                ("127.0.0.1", self.status_port),
+            )
+        except OSError as e:
+            print(f"Error sending audio status: {e}")
+
+    def _mark_audio_written(self):
+        "Record a finished playback write and arm the idle timer if needed"
+        self.last_write_ts = time.monotonic()
+        if self.idle_timer is None:
+            self.idle_timer = asyncio.get_running_loop().call_later(
+                AUDIO_IDLE_DELAY, self._check_audio_idle
+            )
+
+    def _check_audio_idle(self):
+        "Report playback as stopped once no write has finished for AUDIO_IDLE_DELAY"
+        remaining = self.last_write_ts + AUDIO_IDLE_DELAY - time.monotonic()
+        if remaining > 0:
+            # More audio was written since the timer was armed
+            self.idle_timer = asyncio.get_running_loop().call_later(
+                remaining, self._check_audio_idle
+            )
+        else:
+            self.idle_timer = None
+            self._report_audio_active(False)
+
     async def play_audio(self):
         stream = await asyncio.to_thread(
             pya.open,
@@ -348,7 +400,9 @@ class AudioLoop:
         )
         while True:
             bytestream = await self.audio_in_queue.get()
+            self._report_audio_active(True)
             await asyncio.to_thread(stream.write, bytestream)
+            self._mark_audio_written()
 
     async def run(self):
         try:
@@ -391,6 +445,12 @@ if __name__ == "__main__":
         help="pixels to stream from",
         choices=["camera", "screen", "none"],
     )
+    parser.add_argument(
+        "--status-port",
+        type=int,
+        default=None,
+        help="localhost UDP port to report audio playback activity to",
+    )
     args = parser.parse_args()
-    main = AudioLoop(video_mode=args.mode)
+    main = AudioLoop(video_mode=args.mode, status_port=args.status_port)
     asyncio.run(main.run())
\ No newline at end of file
@@ -15,100 +15,36 @@ Usage:
     Press Ctrl+Alt+G to toggle (start/stop) TalkStream.
 """
 
-import os
-import sys
-import subprocess
+import logging
+import queue
 import threading
-import time
+import subprocess
 import keyboard
-from plyer import notification
 import argparse
-import psutil
-import win32gui
+import win32api
 import win32con
 
+from talkstream_common import (
+    BASE_CMD,
+    CREATION_FLAGS,
+    GEMINI_EXISTS,
+    GEMINI_SCRIPT,
+    STARTUPINFO,
+    ProcState,
+    enqueue_hotkey_action,
+    hide_console_window,
+    is_process_running,
+    register_hotkeys,
+    show_notification,
+    terminate_process,
+    unregister_hotkeys,
+)
+
 # Default hotkey combination (can be customized)
 DEFAULT_HOTKEY = "ctrl+alt+g"
 
-# Global variable to track the running process
-talkstream_process = None
-
-def show_notification(title, message):
-    """
-    Display a toast notification with the given title and message.
-    
-    Args:
-        title (str): The notification title
-        message (str): The notification message
-    """
-    try:
-        # Force toast notification style on Windows
-        notification.notify(
-            title=title,
-            message=message,
-            app_name="TalkStream",
-            timeout=5,  # seconds
-            toast=True  # Ensure toast notification on Windows
-        )
-    except Exception as e:
-        print(f"Failed to show notification: {e}")
-
-def is_process_running(process):
-    """
-    Check if a process is still running.
-    
-    Args:
-        process: The process object to check
-        
-    Returns:
-        bool: True if the process is running, False otherwise
-    """
-    if process is None:
-        return False
-        
-    try:
-        return process.poll() is None
-    except:
-        return False
-
-def terminate_process(process):
-    """
-    Terminate a process and all its children.
-    
-    Args:
-        process: The process object to terminate
-    """
-    if process is None:
-        return
-        
-    try:
-        # Get the process ID
-        pid = process.pid
-        
-        # Create a psutil process from the pid
-        parent = psutil.Process(pid)
-        
-        # Terminate all child processes
-        for child in parent.children(recursive=True):
-            try:
-                child.terminate()
-            except:
-                pass
-                
-        # Terminate the parent process
-        parent.terminate()
-        
-        # Wait for processes to terminate
-        gone, still_alive = psutil.wait_procs([parent], timeout=3)
-        
-        # Force kill any remaining processes
-        for p in still_alive:
-            try:
-                p.kill()
-            except:
-                pass
-    except Exception as e:
-        print(f"Error terminating process: {e}")
+# Global state tracking the running process
+talkstream_state = ProcState()
 
 def launch_gemini_liveapi(mode="screen"):
     """
@@ -120,46 +56,36 @@ def launch_gemini_liveapi(mode="screen"):
     Returns:
         subprocess.Popen: The process object if launched successfully, None otherwise
     """
-    global talkstream_process
-    
     # If already running, terminate it
-    if is_process_running(talkstream_process):
-        terminate_process(talkstream_process)
+    if is_process_running(talkstream_state):
+        terminate_process(talkstream_state)
         show_notification(
             "TalkStream Stopped", 
             "TalkStream has been closed"
         )
-        talkstream_process = None
+        talkstream_state.set(None)
         return None
     
-    # Get the directory of the current script
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    gemini_script = os.path.join(script_dir, "gemini_liveapi.py")
-    
-    # Ensure the script exists
-    if not os.path.exists(gemini_script):
-        print(f"Error: Could not find {gemini_script}")
-        show_notification("TalkStream Error", f"Could not find {gemini_script}")
+    # Ensure the script exists (the user was notified at startup)
+    if not GEMINI_EXISTS:
+        print(f"Error: Could not find {GEMINI_SCRIPT}")
         return None
     
     # Launch the script in a new process
     try:
         # Use Python executable from current environment
-        python_exe = sys.executable
-        cmd = [python_exe, gemini_script, "--mode", mode]
+        cmd = BASE_CMD + ["--mode", mode]
         
         # Launch silently in the background
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-        startupinfo.wShowWindow = subprocess.SW_HIDE
-        
         process = subprocess.Popen(
             cmd,
-            startupinfo=startupinfo,
+            startupinfo=STARTUPINFO,
+            # stdin stays a pipe so the child's text prompt blocks instead of
+            # hitting EOF; its output is never read, so discard it
             stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            creationflags=subprocess.CREATE_NO_WINDOW
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            creationflags=CREATION_FLAGS
         )
         
         # Show notification
@@ -184,47 +110,61 @@ def toggle_talkstream(mode):
     Args:
         mode (str): The video mode to use when launching
     """
-    global talkstream_process
+    # Always poll fresh on an explicit toggle
+    talkstream_state.invalidate()
     
-    if is_process_running(talkstream_process):
+    if is_process_running(talkstream_state):
         # TalkStream is running, stop it
-        terminate_process(talkstream_process)
+        terminate_process(talkstream_state)
         show_notification(
             "TalkStream Stopped", 
             "TalkStream has been closed"
         )
-        talkstream_process = None
+        talkstream_state.set(None)
     else:
         # TalkStream is not running, start it
-        talkstream_process = launch_gemini_liveapi(mode)
+        talkstream_state.set(launch_gemini_liveapi(mode))
 
-def register_hotkey(hotkey, mode):
+def _normalize_key_name(name):
+    """Map keyboard event names like 'left ctrl' to the names used in hotkey strings."""
+    name = (name or "").lower()
+    for prefix in ("left ", "right "):
+        if name.startswith(prefix):
+            return name[len(prefix):]
+    return name
+
+def listen_for_hotkey(hotkey, mode):
     """
-    Register a hotkey to toggle TalkStream.
+    Match a single hotkey by reading raw key events.
+    
+    One persistent keyboard hook feeds every event into a queue, and this
+    thread blocks on it until the next event, so no hotkey matcher or
+    timer runs between key presses. keyboard.read_event() would hook and
+    unhook per call and drop events in between, leaving keys stuck in
+    the pressed set.
     
     Args:
-        hotkey (str): The hotkey combination to register
+        hotkey (str): The hotkey combination, e.g. "ctrl+alt+g"
         mode (str): The video mode to use when launching
     """
-    def hotkey_callback():
-        toggle_talkstream(mode)
-    
-    try:
-        keyboard.add_hotkey(hotkey, hotkey_callback)
-        print(f"Registered hotkey: {hotkey} for {mode} mode")
-    except Exception as e:
-        print(f"Failed to register hotkey: {e}")
-
-def hide_console_window():
-    """Hide the console window on Windows."""
-    try:
-        # Get the handle to the console window
-        console_window = win32gui.GetForegroundWindow()
-        
-        # Hide the window
-        win32gui.ShowWindow(console_window, win32con.SW_HIDE)
-    except Exception as e:
-        print(f"Failed to hide console window: {e}")
+    parts = [_normalize_key_name(part.strip()) for part in hotkey.split("+")]
+    modifiers, key = set(parts[:-1]), parts[-1]
+    pressed = set()
+    events = queue.Queue()
+    keyboard.hook(events.put)
+    
+    while True:
+        event = events.get()
+        name = _normalize_key_name(event.name)
+        if event.event_type == keyboard.KEY_DOWN:
+            # Ignore auto-repeat while the key is held down
+            if name in pressed:
+                continue
+            pressed.add(name)
+            if name == key and modifiers <= pressed:
+                enqueue_hotkey_action(lambda: toggle_talkstream(mode))
+        else:
+            pressed.discard(name)
 
 def main():
     """Main entry point for the script."""
@@ -234,8 +174,14 @@ def main():
     parser.add_argument("--mode", type=str, default="screen", 
                       choices=["camera", "screen", "window", "none", "audio"],
                       help="Video mode to use (default: screen)")
+    parser.add_argument("--use-read-event", action="store_true",
+                      help="Match the hotkey by reading raw key events instead of "
+                           "registering it with the OS")
     args = parser.parse_args()
     
+    # Show messages from the shared helpers on the console like our own prints
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     # Hide console window if requested
     hide_console_window()
     
@@ -244,26 +190,43 @@ def main():
         "TalkStream Hotkey Launcher", 
         f"Press {args.hotkey} to toggle TalkStream"
     )
-    
-    # Register the hotkey
-    register_hotkey(args.hotkey, args.mode)
+    if not GEMINI_EXISTS:
+        show_notification("TalkStream Error", f"Could not find {GEMINI_SCRIPT}")
+    
+    # Listen for the hotkey
+    if args.use_read_event:
+        threading.Thread(
+            target=listen_for_hotkey, args=(args.hotkey, args.mode), daemon=True
+        ).start()
+    else:
+        register_hotkeys([(args.hotkey, lambda: toggle_talkstream(args.mode))])
     
     # Keep the script running
     print(f"TalkStream Hotkey Launcher running...")
     print(f"Press {args.hotkey} to toggle TalkStream in {args.mode} mode")
     print("Press Ctrl+C to exit")
     
-    try:
-        # Keep the script running
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("Exiting...")
-        keyboard.unhook_all()
-        
-        # Ensure TalkStream is terminated when exiting
-        if is_process_running(talkstream_process):
-            terminate_process(talkstream_process)
+    # Block the main thread until Ctrl+C instead of waking up every second.
+    # A Python signal handler would never run while the main thread waits on
+    # the event, so take Ctrl+C from the console control handler thread.
+    stop_evt = threading.Event()
+    
+    def on_console_ctrl(ctrl_type):
+        if ctrl_type in (win32con.CTRL_C_EVENT, win32con.CTRL_BREAK_EVENT):
+            stop_evt.set()
+            return True
+        return False
+    
+    win32api.SetConsoleCtrlHandler(on_console_ctrl, True)
+    stop_evt.wait()
+    
+    print("Exiting...")
+    unregister_hotkeys()
+    
+    # Ensure TalkStream is terminated when exiting
+    talkstream_state.invalidate()
+    if is_process_running(talkstream_state):
+        terminate_process(talkstream_state)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,409 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Shared helpers for the TalkStream launchers
+
+Both main.py (hotkey launcher) and tray_app.py (tray application) start
+the gemini_liveapi.py script as a child process, track it, stop it and
+bind hotkeys to it. The pieces they have in common live here.
+"""
+
+import os
+import sys
+import ctypes
+from ctypes import wintypes
+import subprocess
+import queue
+import threading
+import time
+import logging
+import traceback
+import keyboard
+import win32gui
+import win32con
+
+# Shared with tray_app.py, which configures it to write tray_app.log
+logger = logging.getLogger("TalkStream")
+
+# Location of the script to launch, resolved once at import
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+GEMINI_SCRIPT = os.path.join(SCRIPT_DIR, "gemini_liveapi.py")
+GEMINI_EXISTS = os.path.exists(GEMINI_SCRIPT)
+
+# Hidden-window startup info and base command, built once and reused per launch
+STARTUPINFO = subprocess.STARTUPINFO()
+STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+STARTUPINFO.wShowWindow = subprocess.SW_HIDE
+BASE_CMD = [sys.executable, GEMINI_SCRIPT]
+
+# Creation flags for the child: no console window
+CREATION_FLAGS = subprocess.CREATE_NO_WINDOW
+
+# How long a process.poll() result is trusted before polling again (seconds)
+PROCESS_POLL_TTL = 0.25
+
+# Maximum number of hotkey presses waiting to be handled
+HOTKEY_QUEUE_SIZE = 8
+
+# Hotkey actions waiting to run on the worker thread
+_hotkey_q = queue.Queue(maxsize=HOTKEY_QUEUE_SIZE)
+
+# Lazily created by _get_notifier(), _get_plyer_notification() and _get_psutil()
+_toaster = None
+_notification = None
+_psutil = None
+
+class ProcState:
+    """
+    Holds the running TalkStream process and caches its liveness.
+
+    Attributes:
+        process: The subprocess.Popen object, or None if not running
+        last_check_ts (float): time.monotonic() of the last poll
+        last_alive (bool): Result of the last poll
+        stopping (bool): True once terminate_process() has been asked to stop it
+    """
+    def __init__(self):
+        self.process = None
+        self.last_check_ts = float("-inf")
+        self.last_alive = False
+        self.stopping = False
+
+    def set(self, process):
+        """Replace the tracked process and force a fresh check."""
+        self.process = process
+        self.stopping = False
+        self.invalidate()
+
+    def invalidate(self):
+        """Force the next is_process_running() call to poll."""
+        self.last_check_ts = float("-inf")
+
+
+def _get_notifier():
+    """
+    Build the win10toast notifier on first use.
+
+    Returns:
+        The win10toast ToastNotifier, or None if win10toast is not installed
+    """
+    global _toaster
+    if _toaster is None:
+        try:
+            from win10toast import ToastNotifier
+            _toaster = ToastNotifier()
+        except ImportError:
+            _toaster = False
+    return _toaster or None
+
+
+def _get_plyer_notification():
+    """Import plyer's notification facade on first use."""
+    global _notification
+    if _notification is None:
+        from plyer import notification as _notification
+    return _notification
+
+
+def show_notification(title, message):
+    """
+    Display a toast notification with the given title and message.
+
+    Args:
+        title (str): The notification title
+        message (str): The notification message
+    """
+    try:
+        toaster = _get_notifier()
+        # Reuse the notifier, threaded so the caller is not blocked. It returns
+        # False instead of queueing while its previous toast is still showing,
+        # so fall back to plyer rather than lose the message
+        if toaster is not None and toaster.show_toast(title, message, duration=5, threaded=True):
+            return
+
+        # Force toast notification style on Windows
+        _get_plyer_notification().notify(
+            title=title,
+            message=message,
+            app_name="TalkStream",
+            timeout=5,  # seconds
+            toast=True  # Ensure toast notification on Windows
+        )
+    except Exception as e:
+        logger.error("Failed to show notification: %s", e)
+
+
+def is_process_running(state):
+    """
+    Check if the tracked process is still running.
+
+    The result of process.poll() is cached for PROCESS_POLL_TTL seconds.
+
+    Args:
+        state (ProcState): The process state to check
+
+    Returns:
+        bool: True if the process is running, False otherwise
+    """
+    if state.process is None:
+        return False
+
+    now = time.monotonic()
+    if now - state.last_check_ts < PROCESS_POLL_TTL:
+        return state.last_alive
+
+    try:
+        alive = state.process.poll() is None
+    except Exception:
+        alive = False
+
+    state.last_check_ts = now
+    state.last_alive = alive
+    return alive
+
+
+def _get_psutil():
+    """Import psutil on first use; it is only needed when taskkill fails."""
+    global _psutil
+    if _psutil is None:
+        import psutil as _psutil
+    return _psutil
+
+
+def terminate_process(state):
+    """
+    Terminate the tracked process and all its children.
+
+    Kills the whole tree with a single taskkill call, falling back to
+    walking the tree with psutil if taskkill does not return in time.
+
+    Args:
+        state (ProcState): The process state to terminate
+    """
+    process = state.process
+    state.stopping = True
+    state.invalidate()
+    if process is None or process.poll() is not None:
+        return
+
+    try:
+        # Kill the whole process tree in one call
+        subprocess.run(
+            ["taskkill", "/PID", str(process.pid), "/T", "/F"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            creationflags=subprocess.CREATE_NO_WINDOW,
+            timeout=2,
+            check=False
+        )
+    except subprocess.TimeoutExpired:
+        try:
+            psutil = _get_psutil()
+
+            parent = psutil.Process(process.pid)
+
+            # Kill all child processes, then the parent; a child that already
+            # exited or cannot be opened is expected here, not an error
+            for child in parent.children(recursive=True):
+                try:
+                    child.kill()
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            parent.kill()
+        except Exception as e:
+            # The parent vanishing mid-walk, or psutil itself being unavailable
+            logger.error("Error terminating process: %s", e)
+    except Exception as e:
+        logger.error("Error terminating process: %s", e)
+
+
+def enqueue_hotkey_action(action):
+    """
+    Hand a hotkey action to the worker thread.
+
+    Runs on the keyboard hook or hotkey message thread, so it must
+    return immediately.
+    Presses beyond HOTKEY_QUEUE_SIZE are dropped.
+
+    Args:
+        action: Callable to run on the worker thread
+    """
+    try:
+        _hotkey_q.put_nowait(action)
+    except queue.Full:
+        logger.warning("Hotkey queue full, dropping key press")
+
+
+def _hotkey_worker():
+    """Run queued hotkey actions off the keyboard hook thread."""
+    while True:
+        action = _hotkey_q.get()
+        try:
+            action()
+        except Exception as e:
+            logger.error("Error handling hotkey: %s", e)
+            logger.error(traceback.format_exc())
+
+
+threading.Thread(target=_hotkey_worker, daemon=True).start()
+
+
+# RegisterHotKey modifier flags and the message it posts
+MOD_ALT = 0x0001
+MOD_CONTROL = 0x0002
+MOD_SHIFT = 0x0004
+MOD_WIN = 0x0008
+MOD_NOREPEAT = 0x4000
+WM_HOTKEY = 0x0312
+WM_QUIT = 0x0012
+
+_MODIFIER_FLAGS = {
+    "ctrl": MOD_CONTROL,
+    "control": MOD_CONTROL,
+    "alt": MOD_ALT,
+    "shift": MOD_SHIFT,
+    "win": MOD_WIN,
+    "windows": MOD_WIN,
+}
+
+_NAMED_KEYS = {
+    "space": 0x20,
+    "enter": 0x0D,
+    "tab": 0x09,
+    "esc": 0x1B,
+    "escape": 0x1B,
+}
+
+# Thread id of the WM_HOTKEY message pump, if one is running
+_native_hotkey_thread_id = None
+
+
+def _parse_native_hotkey(hotkey):
+    """
+    Translate a hotkey string into RegisterHotKey arguments.
+
+    Args:
+        hotkey (str): A hotkey such as "ctrl+alt+g"
+
+    Returns:
+        tuple: (modifiers, virtual_key), or None if the hotkey uses keys
+        that are not mapped here or has no modifier. RegisterHotKey swallows
+        the keystroke, so a bare key like "f9" would stop reaching every
+        other program; those are left to the keyboard library.
+    """
+    parts = [part.strip().lower() for part in hotkey.split("+")]
+    modifiers = 0
+    for part in parts[:-1]:
+        if part not in _MODIFIER_FLAGS:
+            return None
+        modifiers |= _MODIFIER_FLAGS[part]
+    if not modifiers:
+        return None
+
+    key = parts[-1]
+    if len(key) == 1 and key.isalnum():
+        vk = ord(key.upper())
+    elif key in _NAMED_KEYS:
+        vk = _NAMED_KEYS[key]
+    elif key[:1] == "f" and key[1:].isdigit() and 1 <= int(key[1:]) <= 24:
+        vk = 0x70 + int(key[1:]) - 1  # VK_F1..VK_F24
+    else:
+        return None
+    return modifiers, vk
+
+
+def _native_hotkey_loop(bindings, failed, ready):
+    """
+    Register hotkeys with the OS and dispatch WM_HOTKEY messages.
+
+    RegisterHotKey posts to the thread that registered the hotkey, so
+    registration and the message pump share this thread.
+
+    Args:
+        bindings (list): (hotkey, modifiers, virtual_key, callback) tuples
+        failed (list): Receives (hotkey, callback) pairs the OS rejected
+        ready (threading.Event): Set once registration is done
+    """
+    global _native_hotkey_thread_id
+
+    user32 = ctypes.windll.user32
+    _native_hotkey_thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+
+    callbacks = {}
+    for hotkey_id, (hotkey, modifiers, vk, callback) in enumerate(bindings, 1):
+        if user32.RegisterHotKey(None, hotkey_id, modifiers | MOD_NOREPEAT, vk):
+            callbacks[hotkey_id] = callback
+            logger.info("Registered hotkey: %s", hotkey)
+        else:
+            failed.append((hotkey, callback))
+    ready.set()
+
+    msg = wintypes.MSG()
+    while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+        if msg.message == WM_HOTKEY and msg.wParam in callbacks:
+            enqueue_hotkey_action(callbacks[msg.wParam])
+
+    for hotkey_id in callbacks:
+        user32.UnregisterHotKey(None, hotkey_id)
+    _native_hotkey_thread_id = None
+
+
+def register_hotkeys(pairs):
+    """
+    Register several hotkeys in a single pass.
+
+    On Windows the hotkeys go to the OS with RegisterHotKey, so no Python
+    code runs for ordinary key presses. Hotkeys that cannot be mapped or
+    that the OS rejects fall back to the keyboard library. Either way the
+    callbacks run on the hotkey worker thread.
+
+    Args:
+        pairs (list): (hotkey, callback) tuples to register
+    """
+    fallback = []
+    if sys.platform == "win32":
+        bindings = []
+        for hotkey, callback in pairs:
+            parsed = _parse_native_hotkey(hotkey)
+            if parsed is None:
+                fallback.append((hotkey, callback))
+            else:
+                bindings.append((hotkey, parsed[0], parsed[1], callback))
+
+        if bindings:
+            ready = threading.Event()
+            threading.Thread(
+                target=_native_hotkey_loop,
+                args=(bindings, fallback, ready),
+                daemon=True
+            ).start()
+            ready.wait(timeout=2)
+    else:
+        fallback = list(pairs)
+
+    for hotkey, callback in fallback:
+        try:
+            keyboard.add_hotkey(hotkey, enqueue_hotkey_action, args=(callback,))
+            logger.info("Registered hotkey: %s", hotkey)
+        except Exception as e:
+            logger.error("Failed to register hotkey %s: %s", hotkey, e)
+
+
+def unregister_hotkeys():
+    """Remove all hotkeys registered by register_hotkeys()."""
+    if _native_hotkey_thread_id is not None:
+        ctypes.windll.user32.PostThreadMessageW(_native_hotkey_thread_id, WM_QUIT, 0, 0)
+    keyboard.unhook_all()
+
+
+def hide_console_window():
+    """Hide the console window on Windows."""
+    try:
+        # Get the handle to the console window
+        console_window = win32gui.GetForegroundWindow()
+
+        # Hide the window
+        win32gui.ShowWindow(console_window, win32con.SW_HIDE)
+    except Exception as e:
+        logger.error("Failed to hide console window: %s", e)
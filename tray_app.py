@@ -14,23 +14,35 @@ Usage:
 """
 
 import os
-import sys
 import subprocess
 import threading
 import time
-import queue
 import logging
 from PIL import Image, ImageDraw
 import pystray
 from pystray import MenuItem as item
 import win32gui
-import psutil
 import json
-import pyaudio
-import keyboard
-import win32con
+import ctypes
+from ctypes import wintypes
+import socket
 import traceback
 
+from talkstream_common import (
+    BASE_CMD,
+    CREATION_FLAGS,
+    GEMINI_EXISTS,
+    GEMINI_SCRIPT,
+    SCRIPT_DIR,
+    STARTUPINFO,
+    ProcState,
+    hide_console_window,
+    is_process_running,
+    register_hotkeys,
+    terminate_process,
+    unregister_hotkeys,
+)
+
 
 # Set up logging
 try:
@@ -62,17 +74,26 @@ except Exception as e:
 ICON_SIZE = (64, 64)
 INACTIVE_COLOR = (100, 100, 100)  # Gray when inactive
 ACTIVE_COLOR = (0, 200, 0)  # Green when audio is playing
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+WINDOW_CONFIG_PATH = os.path.join(SCRIPT_DIR, "window_config.json")
 DEFAULT_HOTKEY = "ctrl+alt+g"  # Default hotkey combination
 VOICE_HOTKEY = "ctrl+alt+v"  # Voice-only mode hotkey
+AUDIO_ACTIVE_MSG = b"1"  # Datagram sent by gemini_liveapi.py when playback starts
+MONITOR_STOP_MSG = b"q"  # Datagram the tray sends itself to stop the monitor thread
+WINDOW_LIST_TTL = 2.0  # Seconds the enumerated window list stays fresh
+_FULLSCREEN_BLOB = b'{"type":"fullscreen"}'  # Pre-encoded configs for the static cases
+_NONE_BLOB = b'{"type":"none"}'
 
 
 # Global variables
-talkstream_process = None
+talkstream_state = ProcState()
 audio_active = False
-audio_status_queue = queue.Queue()
+audio_status_socket = None
 selected_window = None
 window_list = []
+window_list_ts = float("-inf")
+last_config_blob = None
+last_config_key = None
+env_api_key_found = False
 tray_icon = None
 
 
@@ -94,131 +115,210 @@ def create_icon(color):
     return img
 
 
+# user32 entry points used to enumerate windows without pywin32 wrappers
+_user32 = ctypes.windll.user32
+_user32.IsWindowVisible.argtypes = [wintypes.HWND]
+_user32.IsWindowVisible.restype = wintypes.BOOL
+_user32.GetWindowTextLengthW.argtypes = [wintypes.HWND]
+_user32.GetWindowTextLengthW.restype = ctypes.c_int
+_user32.GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+_user32.GetWindowTextW.restype = ctypes.c_int
+
+
+# The tray only ever shows these two icons, so render them once
+_ICON_INACTIVE = create_icon(INACTIVE_COLOR)
+_ICON_ACTIVE = create_icon(ACTIVE_COLOR)
+
+
 def get_window_list():
-    """Get a list of all visible windows"""
-    global window_list
-    window_list = []
+    """Get a list of all visible windows, re-enumerating at most every WINDOW_LIST_TTL"""
+    global window_list, window_list_ts
+    
+    now = time.monotonic()
+    if now - window_list_ts < WINDOW_LIST_TTL:
+        return window_list
+    
+    windows = []
+    
+    # Bind the user32 calls once instead of looking them up per window
+    is_window_visible = _user32.IsWindowVisible
+    get_window_text_length = _user32.GetWindowTextLengthW
+    get_window_text = _user32.GetWindowTextW
+    create_buffer = ctypes.create_unicode_buffer
+    append = windows.append
     
     def enum_windows_callback(hwnd, _):
-        if win32gui.IsWindowVisible(hwnd) and win32gui.GetWindowText(hwnd):
+        # Skip hidden and untitled windows before allocating a buffer
+        if not is_window_visible(hwnd):
+            return True
+        length = get_window_text_length(hwnd)
+        if length:
             # Get window title
-            title = win32gui.GetWindowText(hwnd)
+            buf = create_buffer(length + 1)
+            get_window_text(hwnd, buf, length + 1)
+            title = buf.value
             # Skip windows with empty titles or system windows
             if title and title != "Program Manager":
-                window_list.append((hwnd, title))
+                # Truncate long titles for the menu
+                display = title if len(title) <= 40 else title[:40] + "..."
+                append((hwnd, title, display))
         return True
     
     win32gui.EnumWindows(enum_windows_callback, None)
+    window_list = windows
+    window_list_ts = now
     return window_list
 
 
+def invalidate_window_list():
+    """Force the next get_window_list() call to re-enumerate"""
+    global window_list_ts
+    window_list_ts = float("-inf")
+
+
+def refresh_window_list():
+    """Re-enumerate the window list, ignoring the cache"""
+    invalidate_window_list()
+    return get_window_list()
+
+
+def refresh_window_menu():
+    """Re-enumerate the window list and rebuild the tray menu from it"""
+    refresh_window_list()
+    if tray_icon is not None:
+        tray_icon.update_menu()
+
+
+def window_action(hwnd):
+    """Create a menu action that selects the given window"""
+    # pystray picks the call signature from the action's argument count, so
+    # this must be a plain zero-argument function rather than a partial
+    return lambda: select_window(hwnd)
+
+
 def get_window_menu_items():
     """Create menu items for each window"""
-    windows = get_window_list()
-    menu_items = []
-    
-    for hwnd, title in windows:
-        # Truncate long titles
-        display_title = title[:40] + "..." if len(title) > 40 else title
-        menu_items.append(
-            item(display_title, lambda _, hwnd=hwnd: select_window(hwnd))
-        )
-    
-    return menu_items
+    return [item(display, window_action(hwnd)) for hwnd, _, display in get_window_list()]
 
 
 def select_window(hwnd):
     """Select a specific window for sharing"""
     global selected_window
     selected_window = hwnd
+    invalidate_window_list()
     
     # If TalkStream is running, restart it with the new window
-    if is_process_running(talkstream_process):
+    talkstream_state.invalidate()
+    if is_process_running(talkstream_state):
         stop_talkstream()
-        start_talkstream(mode="window")
+        talkstream_state.set(start_talkstream(mode="window"))
 
 
 def create_window_config(hwnd=None):
     """Create a window config file for screen sharing"""
-    config = {}
+    # Same target as the config on disk: skip the title lookup and encoding
+    key = ("fullscreen",) if hwnd is None else ("window", hwnd)
+    if key == last_config_key and os.path.exists(WINDOW_CONFIG_PATH):
+        return WINDOW_CONFIG_PATH
     
     if hwnd is None:
         # Full screen config
-        config["type"] = "fullscreen"
+        blob = _FULLSCREEN_BLOB
     else:
         # Specific window config
-        config["type"] = "window"
-        config["hwnd"] = hwnd
-        config["title"] = win32gui.GetWindowText(hwnd)
-    
-    # Write config to temporary file
-    config_path = os.path.join(SCRIPT_DIR, "window_config.json")
-    with open(config_path, "w") as f:
-        json.dump(config, f)
+        # ensure_ascii stays on: the child reads the file in the locale code page
+        blob = json.dumps({
+            "type": "window",
+            "hwnd": hwnd,
+            "title": win32gui.GetWindowText(hwnd),
+        }, separators=(",", ":")).encode("ascii")
     
-    return config_path
+    return write_config(blob, key)
 
 
-def is_process_running(process):
-    """Check if a process is still running"""
-    if process is None:
-        return False
+def write_config(blob, key=None):
+    """Write the encoded window config, skipping the write if the contents are unchanged"""
+    global last_config_blob, last_config_key
+    
+    if blob == last_config_blob and os.path.exists(WINDOW_CONFIG_PATH):
+        last_config_key = key
+        return WINDOW_CONFIG_PATH
     
+    # Write to a temporary file and swap it in so the child never reads a partial file
+    tmp_path = WINDOW_CONFIG_PATH + ".tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0))
     try:
-        return process.poll() is None
-    except Exception:
-        return False
+        os.write(fd, blob)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, WINDOW_CONFIG_PATH)
+    
+    # Only record the target once the file on disk matches it, so a failed
+    # write is retried instead of skipped by create_window_config
+    last_config_blob = blob
+    last_config_key = key
+    return WINDOW_CONFIG_PATH
+
+
+def log_output(stream, log, prefix):
+    """Log each line read from a child process pipe until it closes"""
+    try:
+        for line in iter(stream.readline, ''):
+            if line:
+                log("%s: %s", prefix, line.strip())
+    except Exception as e:
+        logger.error("Error reading TalkStream output: %s", e)
 
 
-def terminate_process(process):
-    """Terminate a process and all its children"""
-    if process is None:
+def watch_talkstream(process):
+    """Log the child's stderr until it closes, then report how the child exited"""
+    log_output(process.stderr, logger.error, "TalkStream error")
+    
+    # stderr only closes once the child is gone, so this does not block for long.
+    # The child needs seconds to import its dependencies, so a failed start
+    # is reported here rather than by waiting on it in start_talkstream.
+    return_code = process.wait()
+    if talkstream_state.process is not process:
         return
+    talkstream_state.invalidate()
+    if return_code and not talkstream_state.stopping:
+        logger.error("TalkStream process exited unexpectedly with code %s", return_code)
+    else:
+        logger.info("TalkStream process exited with code %s", return_code)
+
+
+def check_env_file():
+    """Check once whether the .env file exists and has GEMINI_API_KEY"""
+    env_file = os.path.join(SCRIPT_DIR, ".env")
+    if not os.path.exists(env_file):
+        logger.error(".env file not found at %s", env_file)
+        return False
     
+    logger.info(".env file found at %s", env_file)
     try:
-        # Get the process ID
-        pid = process.pid
-        
-        # Create a psutil process from the pid
-        parent = psutil.Process(pid)
-        
-        # Terminate all child processes
-        for child in parent.children(recursive=True):
-            try:
-                child.terminate()
-            except Exception:
-                pass
-        
-        # Terminate the parent process
-        parent.terminate()
-        
-        # Wait for processes to terminate
-        gone, still_alive = psutil.wait_procs([parent], timeout=3)
-        
-        # Force kill any remaining processes
-        for p in still_alive:
-            try:
-                p.kill()
-            except Exception:
-                pass
+        with open(env_file, "r") as f:
+            env_contents = f.read()
     except Exception as e:
-        print(f"Error terminating process: {e}")
+        logger.error("Error reading .env file: %s", e)
+        return False
+    
+    logger.info(".env file contains %d characters", len(env_contents))
+    if "GEMINI_API_KEY" in env_contents:
+        logger.info("GEMINI_API_KEY found in .env file")
+        return True
+    logger.error("GEMINI_API_KEY not found in .env file")
+    return False
 
 
 def start_talkstream(mode="screen"):
     """Start TalkStream with the specified mode"""
-    global talkstream_process
-    
     try:
-        # Get the path to the gemini_liveapi.py script
-        gemini_script = os.path.join(SCRIPT_DIR, "gemini_liveapi.py")
-        
-        # Ensure the script exists
-        if not os.path.exists(gemini_script):
-            logger.error(f"Error: Could not find {gemini_script}")
+        # Ensure the script exists (checked once at startup)
+        if not GEMINI_EXISTS:
+            logger.error("Error: Could not find %s", GEMINI_SCRIPT)
             return None
         
-        logger.info(f"Starting TalkStream in {mode} mode")
+        logger.info("Starting TalkStream in %s mode", mode)
         
         # Create window config if needed
         if mode == "window" and selected_window is not None:
@@ -227,250 +327,162 @@ def start_talkstream(mode="screen"):
             create_window_config(None)
         elif mode == "none":
             # Create a dummy config for audio-only mode
-            config_path = os.path.join(SCRIPT_DIR, "window_config.json")
-            with open(config_path, "w") as f:
-                json.dump({"type": "none"}, f)
+            write_config(_NONE_BLOB)
         
-        # Check if .env file exists and has GEMINI_API_KEY
-        env_file = os.path.join(SCRIPT_DIR, ".env")
-        if os.path.exists(env_file):
-            logger.info(f".env file found at {env_file}")
-            try:
-                with open(env_file, "r") as f:
-                    env_contents = f.read()
-                    logger.info(f".env file contains {len(env_contents)} characters")
-                    if "GEMINI_API_KEY" in env_contents:
-                        logger.info("GEMINI_API_KEY found in .env file")
-                    else:
-                        logger.error("GEMINI_API_KEY not found in .env file")
-            except Exception as e:
-                logger.error(f"Error reading .env file: {e}")
-        else:
-            logger.error(f".env file not found at {env_file}")
+        # The .env file was inspected once in main(); just repeat its verdict
+        if not env_api_key_found:
+            logger.warning("GEMINI_API_KEY was not found in .env at startup")
         
         # Launch the script in a new process
         try:
             # Use Python executable from current environment
-            python_exe = sys.executable
-            cmd = [python_exe, gemini_script, "--mode", mode]
+            cmd = BASE_CMD + ["--mode", mode]
+            if audio_status_socket is not None:
+                cmd += ["--status-port", str(audio_status_socket.getsockname()[1])]
             
-            logger.debug(f"Executing command: {' '.join(cmd)}")
+            logger.debug("Executing command: %s", cmd)
             
             # Create environment with system environment variables
             # This ensures the subprocess inherits variables like PATH
             env = os.environ.copy()
             
-            # Launch silently in the background
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = subprocess.SW_HIDE
+            # stdout is logged at DEBUG, so only pipe it when DEBUG is enabled;
+            # otherwise discard it and drain just stderr
+            read_stdout = logger.isEnabledFor(logging.DEBUG)
             
+            # Launch silently in the background
             process = subprocess.Popen(
                 cmd,
-                startupinfo=startupinfo,
+                startupinfo=STARTUPINFO,
                 stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
+                stdout=subprocess.PIPE if read_stdout else subprocess.DEVNULL,
                 stderr=subprocess.PIPE,
-                creationflags=subprocess.CREATE_NO_WINDOW,
+                creationflags=CREATION_FLAGS,
                 cwd=SCRIPT_DIR,  # Explicitly set working directory
                 env=env,  # Pass the environment variables
-                universal_newlines=True  # Use text mode for easier output handling
+                universal_newlines=True,  # Use text mode for easier output handling
+                bufsize=1  # Line buffered
             )
             
-            # Start a thread to log any output from the process
-            def log_output(proc):
-                try:
-                    for line in iter(proc.stdout.readline, ''):
-                        if line:
-                            logger.info(f"TalkStream output: {line.strip()}")
-                except Exception as e:
-                    logger.error(f"Error reading stdout: {e}")
-            
-            def log_errors(proc):
-                try:
-                    for line in iter(proc.stderr.readline, ''):
-                        if line:
-                            logger.error(f"TalkStream error: {line.strip()}")
-                except Exception as e:
-                    logger.error(f"Error reading stderr: {e}")
+            # Start threads to log any output from the process. At DEBUG that is
+            # one reader per pipe: Windows pipes cannot be multiplexed with
+            # select, and merging them would log stderr at stdout's level.
+            if read_stdout:
+                threading.Thread(
+                    target=log_output,
+                    args=(process.stdout, logger.debug, "TalkStream output"),
+                    daemon=True
+                ).start()
+            threading.Thread(target=watch_talkstream, args=(process,), daemon=True).start()
             
-            # Start the output reading threads
-            threading.Thread(target=log_output, args=(process,), daemon=True).start()
-            threading.Thread(target=log_errors, args=(process,), daemon=True).start()
-            
-            # Check if process is still running after a short delay
-            time.sleep(1)
-            if is_process_running(process):
-                logger.info(f"Launched TalkStream in {mode} mode (PID: {process.pid})")
-                return process
-            else:
-                return_code = process.poll()
-                logger.error(f"TalkStream process exited immediately with code {return_code}")
-                return None
+            logger.info("Launched TalkStream in %s mode (PID: %s)", mode, process.pid)
+            return process
         
         except Exception as e:
-            logger.error(f"Failed to launch TalkStream: {e}")
+            logger.error("Failed to launch TalkStream: %s", e)
             logger.error(traceback.format_exc())
             return None
     
     except Exception as e:
-        logger.error(f"Error in start_talkstream: {e}")
+        logger.error("Error in start_talkstream: %s", e)
         logger.error(traceback.format_exc())
         return None
 
 
 def stop_talkstream():
     """Stop TalkStream if it's running"""
-    global talkstream_process
-    
-    if is_process_running(talkstream_process):
-        terminate_process(talkstream_process)
-        talkstream_process = None
+    talkstream_state.invalidate()
+    if is_process_running(talkstream_state):
+        terminate_process(talkstream_state)
+    talkstream_state.set(None)
 
 
 def toggle_talkstream(mode="screen"):
     """Toggle TalkStream on/off with the specified mode"""
-    global talkstream_process
-    
     try:
-        logger.info(f"Toggling TalkStream ({mode} mode)")
+        logger.info("Toggling TalkStream (%s mode)", mode)
+        
+        # Always poll fresh on an explicit toggle
+        talkstream_state.invalidate()
         
-        if is_process_running(talkstream_process):
+        if is_process_running(talkstream_state):
             logger.info("TalkStream is running, stopping it")
             stop_talkstream()
         else:
-            logger.info(f"TalkStream is not running, starting it in {mode} mode")
-            talkstream_process = start_talkstream(mode)
+            logger.info("TalkStream is not running, starting it in %s mode", mode)
+            talkstream_state.set(start_talkstream(mode))
             
-            # Check if process started correctly
-            if talkstream_process is None:
+            # None means the launch itself failed (start_talkstream logged why);
+            # a child that exits early is reported later by watch_talkstream
+            if talkstream_state.process is None:
                 logger.error("Failed to start TalkStream")
-            elif not is_process_running(talkstream_process):
-                logger.error("TalkStream process failed to start or terminated immediately")
     except Exception as e:
-        logger.error(f"Error in toggle_talkstream: {e}")
+        logger.error("Error in toggle_talkstream: %s", e)
         logger.error(traceback.format_exc())
 
 
-def monitor_audio_activity():
-    """Monitor the audio activity of TalkStream"""
+def create_audio_status_socket():
+    """Bind the localhost UDP socket TalkStream reports audio activity to"""
+    global audio_status_socket
+    
+    # Port 0 lets the OS pick a free port, which is passed to the child
+    audio_status_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    audio_status_socket.bind(("127.0.0.1", 0))
+    audio_status_socket.settimeout(1.0)
+    logger.info(f"Listening for audio status on port {audio_status_socket.getsockname()[1]}")
+    return audio_status_socket
+
+
+def monitor_audio_activity(sock):
+    """Monitor the audio activity datagrams sent by TalkStream"""
     global audio_active, tray_icon
     
+    last_state = None
+    
     while True:
         try:
-            # Check if there's a new audio status in the queue
+            # Block until a status arrives; the timeout re-checks process death
             try:
-                audio_active = audio_status_queue.get(block=False)
-            except queue.Empty:
+                data, _ = sock.recvfrom(16)
+                if data == MONITOR_STOP_MSG:
+                    break
+                audio_active = data == AUDIO_ACTIVE_MSG
+            except socket.timeout:
                 pass
             
-            # Update the icon if TalkStream is running
-            if is_process_running(talkstream_process) and tray_icon:
-                if audio_active:
-                    tray_icon.icon = create_icon(ACTIVE_COLOR)
-                else:
-                    tray_icon.icon = create_icon(INACTIVE_COLOR)
+            # A stopped process cannot report that its audio ended
+            running = is_process_running(talkstream_state)
+            if not running:
+                audio_active = False
             
-            time.sleep(0.1)
+            # Update the icon only when the visible state changes
+            new_state = audio_active and running
+            if tray_icon and new_state != last_state:
+                tray_icon.icon = _ICON_ACTIVE if new_state else _ICON_INACTIVE
+                last_state = new_state
         except Exception as e:
             print(f"Error in audio monitoring: {e}")
             time.sleep(1)
 
 
-def patch_audio_play():
-    """
-    Patch the play_audio method in gemini_liveapi.py to detect audio activity
-    This is done by creating a proxy class that will be used in place of the original
-    """
-    global audio_status_queue
-    
+def stop_audio_monitor(sock, thread):
+    """Wake the monitor thread with a stop datagram and wait for it to exit"""
     try:
-        logger.info("Patching PyAudio.open to detect audio activity")
-        
-        # Create a proxy class for PyAudio.Stream
-        original_open = pyaudio.PyAudio.open
-        
-        def patched_open(self, *args, **kwargs):
-            try:
-                # Call the original open method
-                stream = original_open(self, *args, **kwargs)
-                
-                # If this is an output stream, patch its write method
-                if kwargs.get('output', False):
-                    logger.info("Patching output stream write method")
-                    original_write = stream.write
-                    
-                    def patched_write(data, *args, **kwargs):
-                        try:
-                            # Signal that audio is active
-                            audio_status_queue.put(True)
-                            
-                            # Schedule a task to set audio inactive after a short delay
-                            def reset_audio_status():
-                                try:
-                                    time.sleep(0.2)  # Short delay to prevent flickering
-                                    audio_status_queue.put(False)
-                                except Exception as e:
-                                    logger.error(f"Error in reset_audio_status: {e}")
-                            
-                            threading.Thread(target=reset_audio_status, daemon=True).start()
-                            
-                            # Call the original write method
-                            return original_write(data, *args, **kwargs)
-                        except Exception as e:
-                            logger.error(f"Error in patched_write: {e}")
-                            return original_write(data, *args, **kwargs)
-                    
-                    # Replace the write method
-                    stream.write = patched_write
-                
-                return stream
-            except Exception as e:
-                logger.error(f"Error in patched_open: {e}")
-                return original_open(self, *args, **kwargs)
-        
-        # Replace the open method
-        pyaudio.PyAudio.open = patched_open
-        logger.info("Successfully patched PyAudio.open")
-    except Exception as e:
-        logger.error(f"Failed to patch audio_play: {e}")
-        logger.error(traceback.format_exc())
-
-
-def register_hotkey(hotkey, mode):
-    """
-    Register a hotkey to toggle TalkStream.
-    
-    Args:
-        hotkey (str): The hotkey combination to register
-        mode (str): The video mode to use when launching
-    """
-    def hotkey_callback():
-        toggle_talkstream(mode)
-    
-    try:
-        keyboard.add_hotkey(hotkey, hotkey_callback)
-        print(f"Registered hotkey: {hotkey} for {mode} mode")
-    except Exception as e:
-        print(f"Failed to register hotkey: {e}")
-
-
-def hide_console_window():
-    """Hide the console window on Windows."""
-    try:
-        # Get the handle to the console window
-        console_window = win32gui.GetForegroundWindow()
-        
-        # Hide the window
-        win32gui.ShowWindow(console_window, win32con.SW_HIDE)
+        sock.sendto(MONITOR_STOP_MSG, sock.getsockname())
+        thread.join(timeout=2)
     except Exception as e:
-        print(f"Failed to hide console window: {e}")
+        logger.error(f"Error stopping audio monitor: {e}")
+    finally:
+        sock.close()
 
 
 def create_menu():
     """Create the tray icon menu"""
-    # Window selection submenu
-    window_menu = item("Select Window", pystray.Menu(*get_window_menu_items()))
+    # Window selection submenu, re-read from the window list whenever pystray
+    # builds the menu. The win32 backend does that at icon setup and on
+    # update_menu(), not each time the menu opens, so windows are still
+    # enumerated once at startup.
+    window_menu = item("Select Window", pystray.Menu(lambda: tuple(get_window_menu_items())))
     
     # Main menu
     menu = pystray.Menu(
@@ -478,7 +490,7 @@ def create_menu():
         item("Start (Selected Window)", lambda: toggle_talkstream("window")),
         item("Start (Audio Only)", lambda: toggle_talkstream("none")),
         window_menu,
-        item("Refresh Window List", lambda: get_window_list()),
+        item("Refresh Window List", lambda: refresh_window_menu()),
         item("Stop TalkStream", stop_talkstream),
         item("Exit", lambda: tray_icon.stop())
     )
@@ -490,13 +502,10 @@ def setup_tray_icon():
     """Set up the system tray icon"""
     global tray_icon
     
-    # Create the initial icon (inactive)
-    icon = create_icon(INACTIVE_COLOR)
-    
-    # Create the tray icon
+    # Create the tray icon, starting inactive
     tray_icon = pystray.Icon(
         "TalkStream", 
-        icon, 
+        _ICON_INACTIVE, 
         "TalkStream", 
         menu=create_menu()
     )
@@ -507,6 +516,8 @@ def setup_tray_icon():
 
 def main():
     """Main entry point"""
+    global env_api_key_found
+    
     try:
         # Parse command line arguments
         import argparse
@@ -521,24 +532,27 @@ def main():
         args = parser.parse_args()
         
         logger.info("Starting TalkStream Tray Application")
+        if not GEMINI_EXISTS:
+            logger.error(f"Could not find {GEMINI_SCRIPT}")
+        
+        # Inspect the .env file once instead of on every launch
+        env_api_key_found = check_env_file()
         
         # Hide console window
         hide_console_window()
         
-        # Register main hotkey
-        register_hotkey(args.hotkey, args.mode)
+        # Register the main hotkey, plus the voice-only hotkey unless disabled
+        hotkeys = [(args.hotkey, lambda: toggle_talkstream(args.mode))]
+        if not args.disable_voice_hotkey:
+            hotkeys.append((VOICE_HOTKEY, lambda: toggle_talkstream("none")))
+        register_hotkeys(hotkeys)
         logger.info(f"Registered hotkey: {args.hotkey} for {args.mode} mode")
-        
-        # Register voice-only hotkey unless disabled
         if not args.disable_voice_hotkey:
-            register_hotkey(VOICE_HOTKEY, "none")
             logger.info(f"Registered voice-only hotkey: {VOICE_HOTKEY}")
         
-        # Patch the audio play method to detect audio activity
-        patch_audio_play()
-        
         # Start the audio monitoring thread
-        audio_thread = threading.Thread(target=monitor_audio_activity, daemon=True)
+        sock = create_audio_status_socket()
+        audio_thread = threading.Thread(target=monitor_audio_activity, args=(sock,), daemon=True)
         audio_thread.start()
         
         # Set up the tray icon (this will block until the icon is stopped)
@@ -547,7 +561,8 @@ def main():
         # Clean up when exiting
         logger.info("Tray application stopping, cleaning up...")
         stop_talkstream()
-        keyboard.unhook_all()
+        stop_audio_monitor(sock, audio_thread)
+        unregister_hotkeys()
         logger.info("Tray application stopped")
     except Exception as e:
         logger.error(f"Fatal error in main: {e}")